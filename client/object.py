@@ -1,6 +1,6 @@
 from typing import Generic, TypeVar, Any
 
-from server.utils import split_address
+from server.utils import split_address, is_valid_ttl
 from .client import Client
 
 K = TypeVar('K')
@@ -35,6 +35,14 @@ class ReplicatedDict(Generic[K, V], ReplicatedObject):
     def __setitem__(self, key, value):
         self._replicate_state('set', key, value)
 
+    def set(self, key: K, value: V, ttl: float = None):
+        if ttl is None:
+            self._replicate_state('set', key, value)
+        elif not is_valid_ttl(ttl):
+            raise ValueError(f'ttl must be a positive number of seconds, got {ttl!r}')
+        else:
+            self._replicate_state('set', key, value, ttl)
+
     def __delitem__(self, key):
         self.__refresh()
         self._replicate_state('delete', key)
@@ -1,38 +1,89 @@
 from collections import UserList, UserDict
 from typing import Any
 
+from .utils import is_valid_ttl
+from .wheel import TimerWheel
+
 
 class Entry:
     term: int
     command: str
     arguments: Any
+    # Leader time when the entry was created, drives key expiry
+    timestamp: float | None
 
-    def __init__(self, term: int, command: str, arguments: Any = None):
+    def __init__(self, term: int, command: str, arguments: Any = None, timestamp: float = None):
         self.term = term
         self.command = command
         self.arguments = arguments
+        self.timestamp = timestamp
 
     def __repr__(self):
-        return f'(term: {self.term}, command: {self.command}, args: {self.arguments})'
+        return f'(term: {self.term}, command: {self.command}, args: {self.arguments}, time: {self.timestamp})'
 
 
 class StateMachine(UserDict):
     last_applied: int
+    # Deadlines of keys set with ttl
+    deadlines: dict[Any, float]
+    # Index of deadlines that have not passed yet
+    __wheel: TimerWheel
+    # Keys whose deadline has passed and that wait for an expire entry
+    __expired: dict[Any, float]
 
     def __init__(self):
         super().__init__({})
         self.last_applied = 0
+        self.deadlines = {}
+        self.__wheel = TimerWheel()
+        self.__expired = {}
+
+    def __forget(self, key: Any):
+        self.deadlines.pop(key, None)
+        self.__wheel.remove(key)
+        self.__expired.pop(key, None)
+
+    def __set(self, key: Any, value: Any, ttl: float | None, timestamp: float | None):
+        # Invalid ttl makes a plain set, a bad entry must not stop the log on every replica
+        deadline = timestamp + ttl if is_valid_ttl(ttl) and type(timestamp) is float else None
+        self.__forget(key)
+        self.data[key] = value
+        if deadline is not None:
+            self.deadlines[key] = deadline
+            self.__wheel.add(key, deadline)
+
+    def __expire(self, expired: list[tuple[Any, float]]):
+        for key, deadline in expired:
+            # Key could have been set again after the leader proposed its expiry
+            if self.deadlines.get(key) == deadline:
+                self.__forget(key)
+                del self.data[key]
 
     def apply(self, entries: list[Entry], end: int):
         not_applied_entries = entries[self.last_applied + 1:end + 1]
         for entry in not_applied_entries:
             self.last_applied += 1
+            if entry.timestamp is not None:
+                self.expired(entry.timestamp)
             if entry.command == 'set':
-                (key, value) = entry.arguments
-                self.data[key] = value
+                (key, value, *ttl) = entry.arguments
+                self.__set(key, value, ttl[0] if ttl else None, entry.timestamp)
             elif entry.command == 'delete':
-                (key) = entry.arguments
-                del self.data[key]
+                (key,) = entry.arguments
+                self.__forget(key)
+                self.data.pop(key, None)
+            elif entry.command == 'expire':
+                self.__expire(entry.arguments)
+
+    def expired(self, now: float) -> dict[Any, float]:
+        self.__expired.update(self.__wheel.advance(now))
+        return self.__expired
+
+    def snapshot(self, now: float) -> dict[Any, Any]:
+        state = self.data.copy()
+        for key in self.expired(now):
+            del state[key]
+        return state
 
 
 class Log(UserList):
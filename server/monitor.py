@@ -0,0 +1,52 @@
+from asyncio import get_event_loop, TimerHandle
+from logging import Logger
+
+
+class LoopMonitor:
+    # Time between two checks in seconds
+    __interval: float
+    # Lag in seconds after which a warning is logged
+    __threshold: float
+    # Time the next check is expected to run at
+    __expected: float
+    # Highest lag seen since the last report
+    __max_lag: float
+    # Number of checks between two lag reports
+    __report_every: int
+    # Number of checks since the last report
+    __checks: int
+    # Timer for the next check
+    __timer: TimerHandle | None
+    # Logger
+    __logger: Logger
+
+    def __init__(self, logger: Logger, interval: float = 0.1, threshold: float = 0.5, report_every: int = 100):
+        self.__logger = logger
+        self.__interval = interval
+        self.__threshold = threshold
+        self.__report_every = report_every
+        self.__max_lag = 0
+        self.__checks = 0
+        self.__timer = None
+
+    def start(self):
+        loop = get_event_loop()
+        self.__expected = loop.time() + self.__interval
+        self.__timer = loop.call_at(self.__expected, self.__check)
+
+    def __check(self):
+        loop = get_event_loop()
+        lag = max(0.0, loop.time() - self.__expected)
+        self.__max_lag = max(self.__max_lag, lag)
+        self.__checks += 1
+        if lag > self.__threshold:
+            self.__logger.warning(f'Event loop lagged by {lag:.3f}s, heartbeats may be late')
+        if self.__checks >= self.__report_every:
+            self.__logger.debug(f'Event loop lag: max {self.__max_lag:.3f}s over last {self.__checks} checks')
+            self.__max_lag = 0
+            self.__checks = 0
+        self.start()
+
+    def stop(self):
+        if self.__timer:
+            self.__timer.cancel()
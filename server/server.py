@@ -2,6 +2,7 @@ from asyncio import get_event_loop, Transport, BaseProtocol, Server as AsyncioSe
 from logging import Logger, getLogger, NOTSET, basicConfig
 from socket import AF_INET
 
+from .monitor import LoopMonitor
 from .protocols import PeerProtocol, ClientProtocol, RaftProtocol
 from .utils import split_address
 
@@ -10,6 +11,7 @@ class Server:
     __address: str
     __network: list[str]
     __logger: Logger
+    __loop_monitor: LoopMonitor
 
     __peer_server: Transport
     __client_server: AsyncioServer
@@ -21,6 +23,7 @@ class Server:
         self.__address = address
         self.__network = network
         self.__create_logger()
+        self.__loop_monitor = LoopMonitor(self.__logger)
         self.__create_protocols()
 
     def __create_logger(self):
@@ -43,6 +46,7 @@ class Server:
         (host, port) = split_address(self.__address)
         self.__peer_server, _ = await loop.create_datagram_endpoint(lambda: self.__peer_protocol, local_addr=(host, port), family=AF_INET)
         self.__client_server = await loop.create_server(self.__create_client_protocol, host=host, port=port, family=AF_INET)
+        self.__loop_monitor.start()
         self.__logger.info(f'Started serving')
 
         for address in self.__network:
@@ -56,6 +60,7 @@ class Server:
         except KeyboardInterrupt:
             pass
         finally:
+            self.__loop_monitor.stop()
             self.__peer_protocol.close()
             self.__peer_server.close()
             self.__client_server.close()
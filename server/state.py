@@ -1,12 +1,18 @@
+import pickle
 from asyncio import get_event_loop, TimerHandle
 from enum import Enum
 from logging import Logger
 from random import randrange
 from statistics import median_low
+from time import time
 from typing import Any
 
 from .log import Log, Entry
 
+# Expire entries are sized so an append entries datagram stays under the 64 KB UDP limit
+EXPIRE_ENTRY_BYTES = 12 * 1024
+EXPIRE_ENTRIES_PER_MESSAGE = 4
+
 
 class StateName(Enum):
     Follower = 'follower'
@@ -207,6 +213,8 @@ class Leader(State):
     __append_entries_timer: TimerHandle
     # Clients waiting for response
     __waiting_clients: dict[int, Any]
+    # Keys and deadlines with an expire entry proposed in this term
+    __expiring: set[tuple[Any, float]]
 
     def __init__(self, state: dict[str, Any]):
         super().__init__(state)
@@ -214,6 +222,7 @@ class Leader(State):
         self.__next_index = self.__init_next_index()
         self.__match_index = self.__init_match_index()
         self.__waiting_clients = {}
+        self.__expiring = set()
         self.__send_peer_append_entries()
 
     def __init_next_index(self):
@@ -230,11 +239,48 @@ class Leader(State):
         match_index[self._address] = 0
         return match_index
 
+    def __propose_expiry(self):
+        now = time()
+        expired = self._log.state_machine.expired(now)
+        # Pairs are compared so a key set again with a new deadline gets its own expire entry
+        self.__expiring.intersection_update(expired.items())
+        pending = [pair for pair in expired.items() if pair not in self.__expiring]
+        if not pending:
+            return
+        self.__expiring.update(pending)
+        entries = [Entry(self._current_term, 'expire', batch, now) for batch in self.__expire_batches(pending)]
+        self._log.append_entries(entries)
+
+    @staticmethod
+    def __expire_batches(pending: list[tuple[Any, float]]):
+        # Sum of the pickled pairs is an upper bound, pickling the whole batch shares framing and memo
+        batch, size = [], 0
+        for pair in pending:
+            pair_size = len(pickle.dumps(pair))
+            if batch and size + pair_size > EXPIRE_ENTRY_BYTES:
+                yield batch
+                batch, size = [], 0
+            batch.append(pair)
+            size += pair_size
+        if batch:
+            yield batch
+
+    @staticmethod
+    def __limit_expire_entries(entries: list[Entry]):
+        expire_entries = 0
+        for index, entry in enumerate(entries):
+            if entry.command == 'expire':
+                expire_entries += 1
+                if expire_entries > EXPIRE_ENTRIES_PER_MESSAGE:
+                    return entries[:index]
+        return entries
+
     def __send_peer_append_entries(self):
+        self.__propose_expiry()
         for address in self._network:
             prev_log_index = min(self._log.last_index, self.__next_index[address] - 1)
             prev_log_entry = self._log[prev_log_index]
-            entries = self._log[self.__next_index[address]: self.__next_index[address] + 100]
+            entries = self.__limit_expire_entries(self._log[self.__next_index[address]: self.__next_index[address] + 100])
             append_entries = {
                 'type': 'append_entries',
                 'address': self._address,
@@ -263,12 +309,12 @@ class Leader(State):
             self._logger.exception(f'[{StateName.Leader}] Received unrecognized message from client')
 
     def __client_get_received(self, client: Any):
-        state = self._log.state_machine.data.copy()
+        state = self._log.state_machine.snapshot(time())
         result = {'type': 'result', 'success': True, 'state': state}
         client.respond(result)
 
     def __client_replicate_received(self, message: dict[str, Any], client: Any):
-        entry = Entry(self._current_term, message['command'], message['arguments'])
+        entry = Entry(self._current_term, message['command'], message['arguments'], time())
         self._log.append_entries([entry])
         self.__waiting_clients[self._log.last_index] = client
         message = {'success': True, 'last_index': self._log.commit_index}
@@ -1,3 +1,7 @@
+from math import isfinite
+from typing import Any
+
+
 def split_address(address: str):
     [host, port] = address.rsplit(':', 1)
     return host, int(port)
@@ -6,3 +10,7 @@ def split_address(address: str):
 def join_address(address: tuple[str, int]):
     (host, port) = address
     return f'{host}:{port}'
+
+
+def is_valid_ttl(ttl: Any):
+    return type(ttl) in (int, float) and isfinite(ttl) and ttl > 0
@@ -0,0 +1,142 @@
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Any
+
+
+class TimerWheel:
+    # Seconds covered by one slot of the lowest level
+    __resolution: float
+    # Number of slots in each level
+    __size: int
+    # Slots of every level, each slot maps keys to their deadlines
+    __levels: list[list[dict[Any, float]]]
+    # Deadlines too far away for the highest level
+    __overflow: dict[Any, float]
+    # Slot holding each key, for removal without searching
+    __locations: dict[Any, dict[Any, float]]
+    # Tick the wheel currently points at
+    __tick: int | None
+    # Keys of the current tick slot ordered by deadline, removed keys are skipped when popped
+    __heap: list[tuple[float, int, Any]]
+    # Tick the heap was built for
+    __heap_tick: int | None
+    # Tie breaker for keys with equal deadlines, keys need not be comparable
+    __counter: count
+
+    def __init__(self, resolution: float = 1.0, size: int = 64, levels: int = 4):
+        self.__resolution = resolution
+        self.__size = size
+        self.__levels = [[{} for _ in range(size)] for _ in range(levels)]
+        self.__overflow = {}
+        self.__locations = {}
+        self.__tick = None
+        self.__heap = []
+        self.__heap_tick = None
+        self.__counter = count()
+
+    def __len__(self):
+        return len(self.__locations)
+
+    def __contains__(self, key: Any):
+        return key in self.__locations
+
+    def __to_tick(self, time: float):
+        return int(time // self.__resolution)
+
+    def __place(self, key: Any, deadline: float):
+        deadline_tick = self.__to_tick(deadline)
+        delta = deadline_tick - self.__tick
+        slot = self.__overflow
+        if delta <= 0:
+            slot = self.__levels[0][self.__tick % self.__size]
+            if self.__heap_tick == self.__tick:
+                heappush(self.__heap, (deadline, next(self.__counter), key))
+        else:
+            for level, slots in enumerate(self.__levels):
+                if delta < self.__size ** (level + 1):
+                    slot = slots[(deadline_tick // self.__size ** level) % self.__size]
+                    break
+        slot[key] = deadline
+        self.__locations[key] = slot
+
+    def __cascade(self):
+        # Higher levels go first, their keys may land in the lower level slot cascaded right after
+        if self.__tick % self.__size ** len(self.__levels) == 0:
+            overflow = self.__overflow
+            self.__overflow = {}
+            for key, deadline in overflow.items():
+                self.__place(key, deadline)
+        for level in range(len(self.__levels) - 1, 0, -1):
+            if self.__tick % self.__size ** level == 0:
+                index = (self.__tick // self.__size ** level) % self.__size
+                slot = self.__levels[level][index]
+                self.__levels[level][index] = {}
+                for key, deadline in slot.items():
+                    self.__place(key, deadline)
+
+    def add(self, key: Any, deadline: float):
+        self.remove(key)
+        if self.__tick is None:
+            self.__tick = self.__to_tick(deadline)
+        self.__place(key, deadline)
+
+    def remove(self, key: Any):
+        slot = self.__locations.pop(key, None)
+        if slot is not None:
+            del slot[key]
+
+    def __next_event(self) -> int | None:
+        # Earliest tick after the current one where a non empty slot is processed or cascaded
+        next_tick = None
+        for level, slots in enumerate(self.__levels):
+            span = self.__size ** level
+            unit = self.__tick // span
+            for offset in range(1, self.__size + 1):
+                if slots[(unit + offset) % self.__size]:
+                    tick = (unit + offset) * span
+                    next_tick = tick if next_tick is None else min(next_tick, tick)
+                    break
+        if self.__overflow:
+            span = self.__size ** len(self.__levels)
+            tick = (self.__tick // span + 1) * span
+            next_tick = tick if next_tick is None else min(next_tick, tick)
+        return next_tick
+
+    def __drain(self, slot: dict[Any, float], due: list[tuple[Any, float]]):
+        for key, deadline in slot.items():
+            del self.__locations[key]
+            due.append((key, deadline))
+        slot.clear()
+
+    def __drain_current(self, now: float, due: list[tuple[Any, float]]):
+        # The current tick is only partly due, the heap avoids rescanning its slot on every call
+        slot = self.__levels[0][self.__tick % self.__size]
+        if self.__heap_tick != self.__tick:
+            self.__heap = [(deadline, next(self.__counter), key) for key, deadline in slot.items()]
+            heapify(self.__heap)
+            self.__heap_tick = self.__tick
+        while self.__heap and self.__heap[0][0] <= now:
+            deadline, _, key = heappop(self.__heap)
+            if self.__locations.get(key) is slot and slot[key] == deadline:
+                del slot[key]
+                del self.__locations[key]
+                due.append((key, deadline))
+
+    def advance(self, now: float) -> list[tuple[Any, float]]:
+        target = self.__to_tick(now)
+        if self.__tick is None or not self.__locations:
+            self.__tick = max(target, self.__tick or target)
+            return []
+        due = []
+        while self.__tick < target:
+            # Every key in a slot before the target tick is due
+            self.__drain(self.__levels[0][self.__tick % self.__size], due)
+            # Empty slots are skipped, the cost depends on the keys due and not on the time elapsed
+            next_tick = self.__next_event()
+            if next_tick is None or next_tick > target:
+                self.__tick = target
+                break
+            self.__tick = next_tick
+            self.__cascade()
+        self.__drain_current(now, due)
+        return due
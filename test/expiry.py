@@ -0,0 +1,111 @@
+from asyncio import new_event_loop, set_event_loop
+from logging import getLogger
+
+import server.state
+from server.log import StateMachine, Entry
+from server.state import Leader
+from server.wheel import TimerWheel
+
+# Small wheel so deadlines land in upper levels and overflow: level 0 covers 4s, level 1 covers 16s
+wheel = TimerWheel(resolution=1.0, size=4, levels=2)
+wheel.advance(0.0)
+wheel.add('level0', 2.5)
+wheel.add('level1', 10.0)
+wheel.add('overflow', 40.0)
+wheel.add('removed', 11.0)
+wheel.add('moved', 5.0)
+wheel.remove('removed')
+wheel.add('moved', 30.0)
+assert len(wheel) == 4
+
+assert wheel.advance(2.0) == []
+assert wheel.advance(2.5) == [('level0', 2.5)]
+assert wheel.advance(9.9) == []
+assert wheel.advance(10.0) == [('level1', 10.0)]
+assert wheel.advance(29.0) == []
+assert wheel.advance(1000.0) == [('moved', 30.0), ('overflow', 40.0)]
+assert len(wheel) == 0
+
+# Long quiet period before a far deadline
+wheel = TimerWheel()
+wheel.advance(0.0)
+wheel.add('lease', 90 * 86400.0)
+assert wheel.advance(30 * 86400.0) == []
+assert wheel.advance(90 * 86400.0) == [('lease', 90 * 86400.0)]
+
+state_machine = StateMachine()
+log = [
+    Entry(0, 'no_op'),
+    Entry(1, 'set', ('a', 1, 5), 100.0),
+    Entry(1, 'set', ('b', 2, 5), 100.0),
+    Entry(1, 'set', ('c', 3), 100.0),
+    Entry(1, 'set', ('bad', 4, '5'), 100.0),
+]
+state_machine.apply(log, len(log) - 1)
+assert state_machine.deadlines == {'a': 105.0, 'b': 105.0}
+assert state_machine.snapshot(104.0) == {'a': 1, 'b': 2, 'c': 3, 'bad': 4}
+assert state_machine.snapshot(105.0) == {'c': 3, 'bad': 4}
+
+# Leader proposes the expiry of a and b, then b is set again before the expire entry is applied
+expired = list(state_machine.expired(106.0).items())
+log.append(Entry(1, 'set', ('b', 20, 10), 106.0))
+log.append(Entry(1, 'expire', expired, 106.0))
+state_machine.apply(log, len(log) - 1)
+assert state_machine.data == {'b': 20, 'c': 3, 'bad': 4}
+assert state_machine.deadlines == {'b': 116.0}
+assert dict(state_machine.expired(110.0)) == {}
+
+# Plain set drops the ttl
+log.append(Entry(1, 'set', ('b', 21), 111.0))
+state_machine.apply(log, len(log) - 1)
+assert state_machine.deadlines == {}
+assert state_machine.snapshot(200.0) == {'b': 21, 'c': 3, 'bad': 4}
+
+
+# Leader path with a stubbed clock, the loop only holds the heartbeat timers and never runs
+class Stub:
+    def send_to_peer(self, message, address):
+        pass
+
+    def respond(self, message):
+        pass
+
+
+clock = [1000.0]
+server.state.time = lambda: clock[0]
+set_event_loop(new_event_loop())
+leader = Leader({'address': 'leader', '__network': ['peer'], 'protocol': Stub(), 'logger': getLogger('expiry'), 'current_term': 1})
+leader_log = leader._log
+
+
+def replicate(*arguments):
+    leader.client_message_received({'type': 'replicate', 'command': 'set', 'arguments': arguments}, Stub())
+
+
+def heartbeat():
+    leader._Leader__send_peer_append_entries()
+
+
+def acknowledge():
+    response = {'type': 'append_entries_response', 'address': 'peer', 'term': 1, 'success': True, 'last_index': leader_log.last_index}
+    leader.peer_message_received(response, 'peer')
+
+
+replicate('k', 1, 0.5)
+acknowledge()
+clock[0] = 1000.6
+heartbeat()
+assert leader_log[leader_log.last_index].arguments == [('k', 1000.5)]
+# Lease renewed before the expire entry commits, the new deadline passes before the next heartbeat
+clock[0] = 1001.0
+replicate('k', 2, 0.5)
+acknowledge()
+assert leader_log.state_machine.deadlines == {'k': 1001.5}
+clock[0] = 1002.0
+heartbeat()
+assert leader_log[leader_log.last_index].arguments == [('k', 1001.5)]
+acknowledge()
+assert leader_log.state_machine.data == {}
+assert leader_log.state_machine.deadlines == {}
+
+print('Expiry checks passed')